@@ -1,7 +1,23 @@
+import math
+
 import matplotlib.pyplot as plt
 import numpy as np
-import matplotlib.cm as cm
 import matplotlib.colors as mcolors
+from matplotlib.collections import PatchCollection
+from scipy.spatial import cKDTree
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    # BubbleChart.collapse falls back to the NumPy implementation of the
+    # same algorithm where numba is not available
+    HAVE_NUMBA = False
+    prange = range
+
+# smaller charts are collapsed on a single thread, for them starting the
+# threads costs more than the batch collision checks themselves
+_PARALLEL_MIN_BUBBLES = 1000
 
 browser_market_share = {
     'browsers': ['firefox', 'chrome', 'safari', 'edge', 'ie', 'opera'],
@@ -10,6 +26,267 @@ browser_market_share = {
 }
 
 
+def _grid_neighbours(x, y, cell_size):
+    """
+    Candidate neighbours of all bubbles, the bubbles in the same or an
+    adjacent cell of a uniform grid with cells of `cell_size`. The candidates
+    of bubble `i` are `near[start[i]:start[i + 1]]`.
+    """
+    n = x.shape[0]
+    # any cell size works for bubbles that cannot collide
+    if not cell_size > 0:
+        cell_size = 1.0
+    x_min = np.float64(x.min())
+    y_min = np.float64(y.min())
+    n_cols = int((x.max() - x_min) / cell_size) + 1
+    n_rows = int((y.max() - y_min) / cell_size) + 1
+    col = np.empty(n, dtype=np.int64)
+    row = np.empty(n, dtype=np.int64)
+
+    # sort the bubbles by cell, row by row. The bubbles in cell `c` are
+    # `by_cell[cell_start[c]:cell_start[c + 1]]`.
+    cell_start = np.zeros(n_rows * n_cols + 1, dtype=np.int64)
+    for j in range(n):
+        col[j] = int((x[j] - x_min) / cell_size)
+        row[j] = int((y[j] - y_min) / cell_size)
+        cell_start[row[j] * n_cols + col[j] + 1] += 1
+    cell_start = np.cumsum(cell_start)
+    fill = cell_start[:-1].copy()
+    by_cell = np.empty(n, dtype=np.int64)
+    for j in range(n):
+        c = row[j] * n_cols + col[j]
+        by_cell[fill[c]] = j
+        fill[c] += 1
+
+    # the adjacent cells of a row are next to each other in `by_cell`
+    start = np.zeros(n + 1, dtype=np.int64)
+    for i in range(n):
+        count = 0
+        for grid_row in range(max(row[i] - 1, 0), min(row[i] + 2, n_rows)):
+            first = grid_row * n_cols + max(col[i] - 1, 0)
+            last = grid_row * n_cols + min(col[i] + 2, n_cols)
+            count += cell_start[last] - cell_start[first]
+        start[i + 1] = start[i] + count
+    near = np.empty(start[n], dtype=np.int64)
+    for i in range(n):
+        k = start[i]
+        for grid_row in range(max(row[i] - 1, 0), min(row[i] + 2, n_rows)):
+            first = grid_row * n_cols + max(col[i] - 1, 0)
+            last = grid_row * n_cols + min(col[i] + 2, n_cols)
+            for idx in range(cell_start[first], cell_start[last]):
+                near[k] = by_cell[idx]
+                k += 1
+    return start, near
+
+
+def _closest_bubble(x, y, r, i, new_x, new_y, spacing, candidates):
+    """
+    Outline distance and index of the bubble among `candidates` closest to
+    bubble `i` if it were centered at (`new_x`, `new_y`). Of equally close
+    bubbles, the one with the lowest index is returned.
+    """
+    closest = -1
+    min_dist = 0.0
+    for j in candidates:
+        if j == i:
+            continue
+        dist = (math.hypot(new_x - np.float64(x[j]), new_y - np.float64(y[j]))
+                - r[i] - r[j] - spacing)
+        if (closest < 0 or dist < min_dist or
+                (dist == min_dist and j < closest)):
+            closest = j
+            min_dist = dist
+    return min_dist, closest
+
+
+def _collides(x, y, r, i, new_x, new_y, spacing, candidates):
+    """
+    Whether bubble `i` would collide with any of the `candidates` if it were
+    centered at (`new_x`, `new_y`). Compares squared distances to avoid the
+    sqrt, in double precision so that the result holds for the stored
+    single precision positions.
+    """
+    for j in candidates:
+        if j == i:
+            continue
+        dx = new_x - np.float64(x[j])
+        dy = new_y - np.float64(y[j])
+        min_dist = np.float64(r[i]) + r[j] + spacing
+        if dx * dx + dy * dy < min_dist * min_dist:
+            return True
+    return False
+
+
+def _batch_collisions(x, y, r, new_xs, new_ys, spacing, start, neighbours,
+                      movable, blocked):
+    """
+    Collision checks of the batched move in `_collapse_kernel`. Clears
+    `movable` for bubbles whose trial position collides with any other bubble
+    at its current position and sets `blocked` for movable bubbles whose
+    trial position collides with the trial position of any other movable
+    bubble. Each bubble only writes its own entries, so the bubbles can be
+    checked in parallel.
+    """
+    n = x.shape[0]
+    for i in prange(n):
+        if movable[i] and _collides(
+                x, y, r, i, new_xs[i], new_ys[i], spacing,
+                neighbours[start[i]:start[i + 1]]):
+            movable[i] = False
+
+    for i in prange(n):
+        blocked[i] = False
+        if not movable[i]:
+            continue
+        for j in neighbours[start[i]:start[i + 1]]:
+            if j == i or not movable[j]:
+                continue
+            dx = new_xs[i] - np.float64(new_xs[j])
+            dy = new_ys[i] - np.float64(new_ys[j])
+            min_dist = np.float64(r[i]) + r[j] + spacing
+            if dx * dx + dy * dy < min_dist * min_dist:
+                blocked[i] = True
+                break
+
+
+def _collapse_kernel(x, y, r, area, spacing, step_dist, n_iterations,
+                     min_step):
+    """
+    Compiled version of `BubbleChart.collapse`, moves the bubbles in place
+    and returns the final step distance.
+    """
+    n = x.shape[0]
+    # weighted sums of the bubble positions, kept up to date on every move
+    sum_x = 0.0
+    sum_y = 0.0
+    sum_w = 0.0
+    for j in range(n):
+        sum_x += np.float64(x[j]) * area[j]
+        sum_y += np.float64(y[j]) * area[j]
+        sum_w += np.float64(area[j])
+
+    # trial positions are rounded to the precision of the stored positions
+    # before they are tested, so that storing them cannot cause overlaps
+    new_xs = np.empty(n, dtype=x.dtype)
+    new_ys = np.empty(n, dtype=y.dtype)
+    movable = np.empty(n, dtype=np.bool_)
+    blocked = np.empty(n, dtype=np.bool_)
+    r_max = np.float64(r.max())
+    for _i in range(n_iterations):
+        # only check for collisions with the bubbles close by. The
+        # neighbours are looked up once per iteration: trial positions are
+        # step_dist away from the current position and every other bubble
+        # moves at most once by step_dist.
+        start, neighbours = _grid_neighbours(
+            x, y, 2 * r_max + spacing + 2 * step_dist)
+
+        # try to move all bubbles directly towards the center of mass,
+        # bubbles sitting on the center of mass do not move
+        com_x = sum_x / sum_w
+        com_y = sum_y / sum_w
+        for i in range(n):
+            dir_x = com_x - x[i]
+            dir_y = com_y - y[i]
+            norm = math.hypot(dir_x, dir_y)
+            movable[i] = norm > 0
+            if movable[i]:
+                new_xs[i] = x[i] + dir_x / norm * step_dist
+                new_ys[i] = y[i] + dir_y / norm * step_dist
+
+        # a bubble is movable if its new position does not collide with any
+        # other bubble at its current position nor with any other movable
+        # bubble at its new position
+        if n >= _PARALLEL_MIN_BUBBLES:
+            _batch_collisions_parallel(x, y, r, new_xs, new_ys, spacing,
+                                       start, neighbours, movable, blocked)
+        else:
+            _batch_collisions(x, y, r, new_xs, new_ys, spacing, start,
+                              neighbours, movable, blocked)
+
+        moves = 0
+        for i in range(n):
+            if movable[i] and not blocked[i]:
+                sum_x += area[i] * (new_xs[i] - np.float64(x[i]))
+                sum_y += area[i] * (new_ys[i] - np.float64(y[i]))
+                x[i] = new_xs[i]
+                y[i] = new_ys[i]
+                moves += 1
+            else:
+                movable[i] = False
+
+        # move the remaining bubbles one by one
+        for i in range(n):
+            if movable[i]:
+                continue
+            near = neighbours[start[i]:start[i + 1]]
+            old_x = np.float64(x[i])
+            old_y = np.float64(y[i])
+            com_x = sum_x / sum_w
+            com_y = sum_y / sum_w
+
+            # try to move directly towards the center of mass
+            dir_x = com_x - old_x
+            dir_y = com_y - old_y
+            norm = math.hypot(dir_x, dir_y)
+            if norm == 0:
+                continue
+            new_x = np.float64(x.dtype.type(old_x + dir_x / norm * step_dist))
+            new_y = np.float64(y.dtype.type(old_y + dir_y / norm * step_dist))
+
+            if not _collides(x, y, r, i, new_x, new_y, spacing, near):
+                x[i] = new_x
+                y[i] = new_y
+                sum_x += area[i] * (new_x - old_x)
+                sum_y += area[i] * (new_y - old_y)
+                moves += 1
+                continue
+
+            # try to move around the bubble that we collide with
+            _, colliding = _closest_bubble(x, y, r, i, new_x, new_y, spacing,
+                                           near)
+            dir_x = x[colliding] - old_x
+            dir_y = y[colliding] - old_y
+            norm = math.hypot(dir_x, dir_y)
+            orth_x = dir_y / norm * step_dist
+            orth_y = -dir_x / norm * step_dist
+            # test which direction to go, comparing the squared distances to
+            # the center of mass. Ties go the second way, also when rounding
+            # makes one side look a tiny bit closer.
+            dist1 = ((old_x + orth_x - com_x) ** 2 +
+                     (old_y + orth_y - com_y) ** 2)
+            dist2 = ((old_x - orth_x - com_x) ** 2 +
+                     (old_y - orth_y - com_y) ** 2)
+            sign = 1.0 if dist1 < dist2 - 1e-9 * (dist1 + dist2) else -1.0
+            new_x = np.float64(x.dtype.type(old_x + sign * orth_x))
+            new_y = np.float64(y.dtype.type(old_y + sign * orth_y))
+
+            if not _collides(x, y, r, i, new_x, new_y, spacing, near):
+                x[i] = new_x
+                y[i] = new_y
+                sum_x += area[i] * (new_x - old_x)
+                sum_y += area[i] * (new_y - old_y)
+
+        if moves / n < 0.1:
+            if step_dist < min_step:
+                break
+            step_dist = step_dist / 2
+    return step_dist
+
+
+if HAVE_NUMBA:
+    # no fastmath, the kernel has to make the same decisions as the NumPy
+    # implementation
+    _grid_neighbours = njit(cache=True)(_grid_neighbours)
+    _closest_bubble = njit(cache=True)(_closest_bubble)
+    _collides = njit(cache=True)(_collides)
+    _batch_collisions_parallel = njit(parallel=True, cache=True)(
+        _batch_collisions)
+    _batch_collisions = njit(cache=True)(_batch_collisions)
+    _collapse_kernel = njit(cache=True)(_collapse_kernel)
+else:
+    _batch_collisions_parallel = _batch_collisions
+
+
 class BubbleChart:
     def __init__(self, area, bubble_spacing=0):
         """
@@ -26,48 +303,96 @@ class BubbleChart:
         -----
         If "area" is sorted, the results might look weird.
         """
-        area = np.asarray(area)
+        area = np.asarray(area, dtype=np.float32)
         r = np.sqrt(area / np.pi)
 
         self.bubble_spacing = bubble_spacing
-        self.bubbles = np.ones((len(area), 4))
-        self.bubbles[:, 2] = r
-        self.bubbles[:, 3] = area
-        self.maxstep = 2 * self.bubbles[:, 2].max() + self.bubble_spacing
+        # x, y, radius and area of the bubbles are stored as the rows of a
+        # single array, each of them is contiguous in memory. Single
+        # precision is plenty for the layout and halves the memory traffic.
+        self._xyra = np.empty((4, len(area)), dtype=np.float32)
+        self.x, self.y, self.r, self.area = self._xyra
+        self.r[:] = r
+        self.area[:] = area
+        self.maxstep = 2 * self.r.max() + self.bubble_spacing
         self.step_dist = self.maxstep / 2
 
+        # the radii never change, so everything plot and highlight derive
+        # from them is computed once
+        self._r_min, self._r_max = r.min(), r.max()
+        self._cmap_colors = {}
+
         # calculate initial grid layout for bubbles
-        length = np.ceil(np.sqrt(len(self.bubbles)))
-        grid = np.arange(length) * self.maxstep
-        gx, gy = np.meshgrid(grid, grid)
-        self.bubbles[:, 0] = gx.flatten()[:len(self.bubbles)]
-        self.bubbles[:, 1] = gy.flatten()[:len(self.bubbles)]
+        length = np.ceil(np.sqrt(len(area)))
+        idx = np.arange(len(area))
+        self.x[:] = idx % length * self.maxstep
+        self.y[:] = idx // length * self.maxstep
 
-        self.com = self.center_of_mass()
+        self._reset_com()
 
-    def center_of_mass(self):
-        return np.average(
-            self.bubbles[:, :2], axis=0, weights=self.bubbles[:, 3]
-        )
+    @property
+    def bubbles(self):
+        """
+        (N, 4) view of the bubble x, y, radius and area.
+        """
+        return self._xyra.T
 
-    def center_distance(self, bubble, bubbles):
-        return np.hypot(bubble[0] - bubbles[:, 0],
-                        bubble[1] - bubbles[:, 1])
+    def _reset_com(self):
+        # weighted position sums, kept up to date by `_move_bubble` so that
+        # the center of mass does not have to be recomputed after each move.
+        # They are kept in double precision since every move adds to them.
+        self._sum_xy = self._xyra[:2].astype(float) @ self.area
+        self._sum_w = self.area.sum(dtype=float)
+        self.com = self._sum_xy / self._sum_w
 
-    def outline_distance(self, bubble, bubbles):
-        center_distance = self.center_distance(bubble, bubbles)
-        return center_distance - bubble[2] - \
-            bubbles[:, 2] - self.bubble_spacing
+    def _move_bubble(self, i, new_x, new_y):
+        old_xy = self._xyra[:2, i].astype(float)
+        self.x[i] = new_x
+        self.y[i] = new_y
+        # follow the stored, rounded position exactly
+        self._sum_xy += self.area[i] * (self._xyra[:2, i] - old_xy)
+        self.com = self._sum_xy / self._sum_w
+
+    def outline_distance(self, x, y, r, candidates, exclude_idx=None):
+        """
+        Outline distances of a bubble with radius `r` centered at (`x`, `y`)
+        to the `candidates`.
+        """
+        candidates = np.asarray(candidates, dtype=int)
+        distance = np.hypot(np.subtract(x, self.x[candidates], dtype=float),
+                            np.subtract(y, self.y[candidates], dtype=float))
+        distance -= self.r[candidates]
+        distance -= r
+        distance -= self.bubble_spacing
+        # ignore the distance of a bubble to itself
+        distance[candidates == exclude_idx] = np.inf
+        return distance
 
-    def check_collisions(self, bubble, bubbles):
-        distance = self.outline_distance(bubble, bubbles)
-        return len(distance[distance < 0])
+    def check_collisions(self, x, y, r, candidates, exclude_idx=None):
+        """
+        Whether a bubble with radius `r` centered at (`x`, `y`) collides with
+        any of the `candidates`. Compares squared center distances to avoid
+        the sqrt, in double precision so that the result holds for the stored
+        single precision positions.
+        """
+        candidates = np.asarray(candidates, dtype=int)
+        dist_sq = np.subtract(x, self.x[candidates], dtype=float)
+        dy = np.subtract(y, self.y[candidates], dtype=float)
+        dist_sq *= dist_sq
+        dy *= dy
+        dist_sq += dy
+        min_dist = np.add(self.r[candidates], r, dtype=float)
+        min_dist += self.bubble_spacing
+        min_dist *= min_dist
+        # ignore the distance of a bubble to itself
+        dist_sq[candidates == exclude_idx] = np.inf
+        return np.any(dist_sq < min_dist)
 
-    def collides_with(self, bubble, bubbles):
-        distance = self.outline_distance(bubble, bubbles)
-        return np.argmin(distance, keepdims=True)
+    def collides_with(self, x, y, r, candidates, exclude_idx=None):
+        distance = self.outline_distance(x, y, r, candidates, exclude_idx)
+        return int(candidates[np.argmin(distance)])
 
-    def collapse(self, n_iterations=50):
+    def collapse(self, n_iterations=50, min_step=None):
         """
         Move bubbles to the center of mass.
 
@@ -75,85 +400,195 @@ class BubbleChart:
         ----------
         n_iterations : int, default: 50
             Number of moves to perform.
+        min_step : float, optional
+            Stop early once hardly any bubble moves anymore and the step
+            distance has shrunk below this. Defaults to 1e-3 times the
+            smallest bubble radius.
+
+        Notes
+        -----
+        Uses a compiled kernel if numba is installed.
         """
+        if min_step is None:
+            min_step = 1e-3 * self._r_min
+
+        if HAVE_NUMBA:
+            self.step_dist = _collapse_kernel(
+                self.x, self.y, self.r, self.area, self.bubble_spacing,
+                self.step_dist, n_iterations, min_step)
+            self._reset_com()
+            return
+
+        # the bubbles might have been moved since the last update
+        self._reset_com()
+
+        # trial positions are rounded to the precision of the stored
+        # positions before they are tested, so that storing them cannot cause
+        # overlaps. The tests themselves are done in double precision.
+        rounded = self.x.dtype.type
+        radii = self.r.astype(float)
+        # bubbles can only collide if their centers are closer than this
+        max_dist = 2 * radii.max() + self.bubble_spacing
         for _i in range(n_iterations):
-            moves = 0
-            for i in range(len(self.bubbles)):
-                rest_bub = np.delete(self.bubbles, i, 0)
+            # try to move all bubbles directly towards the center of mass
+            # direction vectors from bubbles to the center of mass
+            dir_x = self.com[0] - self.x
+            dir_y = self.com[1] - self.y
+
+            # shorten direction vectors to have length of 1, bubbles sitting
+            # on the center of mass have no direction and do not move
+            norm = np.hypot(dir_x, dir_y)
+            at_com = norm == 0
+            norm[at_com] = 1
+            dir_x /= norm
+            dir_y /= norm
+
+            # calculate new bubble positions
+            new_x = (self.x + dir_x * self.step_dist).astype(self.x.dtype)
+            new_y = (self.y + dir_y * self.step_dist).astype(self.y.dtype)
+
+            # a bubble is movable if its new position does not collide with
+            # any other bubble at its current position ...
+            tree = cKDTree(np.column_stack((self.x, self.y)))
+            new_tree = cKDTree(np.column_stack((new_x, new_y)))
+            pairs = new_tree.sparse_distance_matrix(
+                tree, max_dist, output_type='ndarray')
+            i, j = pairs['i'], pairs['j']
+            collisions = (i != j) & (
+                pairs['v'] < radii[i] + radii[j] + self.bubble_spacing)
+            movable = ~at_com
+            movable[i[collisions]] = False
+
+            # ... nor with any other movable bubble at its new position
+            i, j = new_tree.query_pairs(max_dist, output_type='ndarray').T
+            collisions = movable[i] & movable[j] & (
+                np.hypot(new_x[i] - new_x[j].astype(float),
+                         new_y[i] - new_y[j].astype(float)) <
+                radii[i] + radii[j] + self.bubble_spacing)
+            movable[i[collisions]] = False
+            movable[j[collisions]] = False
+
+            weights = self.area[movable]
+            self._sum_xy[0] += weights @ np.subtract(
+                new_x[movable], self.x[movable], dtype=float)
+            self._sum_xy[1] += weights @ np.subtract(
+                new_y[movable], self.y[movable], dtype=float)
+            self.com = self._sum_xy / self._sum_w
+            self.x[movable] = new_x[movable]
+            self.y[movable] = new_y[movable]
+            moves = np.count_nonzero(movable)
+
+            # move the remaining bubbles one by one, only checking for
+            # collisions with the bubbles close by. The neighbours are
+            # looked up once for both trial moves of a bubble: trial
+            # positions are step_dist away from the position in the tree
+            # and every other bubble moves at most once more by step_dist.
+            remaining = np.flatnonzero(~movable)
+            tree = cKDTree(np.column_stack((self.x, self.y)))
+            neighbours = tree.query_ball_point(
+                np.column_stack((self.x[remaining], self.y[remaining])),
+                self.r[remaining] + self._r_max + self.bubble_spacing +
+                2 * self.step_dist)
+            for i, near in zip(remaining, neighbours):
+                x, y, r = self._xyra[:3, i].astype(float)
+                com_x, com_y = self.com
+
                 # try to move directly towards the center of mass
                 # direction vector from bubble to the center of mass
-                dir_vec = self.com - self.bubbles[i, :2]
+                dir_x = com_x - x
+                dir_y = com_y - y
 
                 # shorten direction vector to have length of 1
-                dir_vec = dir_vec / np.sqrt(dir_vec.dot(dir_vec))
+                norm = math.hypot(dir_x, dir_y)
+                if norm == 0:
+                    continue
 
                 # calculate new bubble position
-                new_point = self.bubbles[i, :2] + dir_vec * self.step_dist
-                new_bubble = np.append(new_point, self.bubbles[i, 2:4])
+                new_x = rounded(x + dir_x / norm * self.step_dist)
+                new_y = rounded(y + dir_y / norm * self.step_dist)
 
                 # check whether new bubble collides with other bubbles
-                if not self.check_collisions(new_bubble, rest_bub):
-                    self.bubbles[i, :] = new_bubble
-                    self.com = self.center_of_mass()
+                if not self.check_collisions(new_x, new_y, r, near, i):
+                    self._move_bubble(i, new_x, new_y)
                     moves += 1
                 else:
                     # try to move around a bubble that you collide with
                     # find colliding bubble
-                    for colliding in self.collides_with(new_bubble, rest_bub):
-                        # calculate direction vector
-                        dir_vec = rest_bub[colliding, :2] - self.bubbles[i, :2]
-                        dir_vec = dir_vec / np.sqrt(dir_vec.dot(dir_vec))
-                        # calculate orthogonal vector
-                        orth = np.array([dir_vec[1], -dir_vec[0]])
-                        # test which direction to go
-                        new_point1 = (self.bubbles[i, :2] + orth *
-                                      self.step_dist)
-                        new_point2 = (self.bubbles[i, :2] - orth *
-                                      self.step_dist)
-                        dist1 = self.center_distance(
-                            self.com, np.array([new_point1]))
-                        dist2 = self.center_distance(
-                            self.com, np.array([new_point2]))
-                        new_point = new_point1 if dist1 < dist2 else new_point2
-                        new_bubble = np.append(new_point, self.bubbles[i, 2:4])
-                        if not self.check_collisions(new_bubble, rest_bub):
-                            self.bubbles[i, :] = new_bubble
-                            self.com = self.center_of_mass()
-
-            if moves / len(self.bubbles) < 0.1:
+                    colliding = self.collides_with(new_x, new_y, r, near, i)
+                    # calculate direction vector
+                    dir_x = self.x[colliding] - x
+                    dir_y = self.y[colliding] - y
+                    norm = math.hypot(dir_x, dir_y)
+                    # calculate orthogonal step
+                    orth_x = dir_y / norm * self.step_dist
+                    orth_y = -dir_x / norm * self.step_dist
+                    # test which direction to go, comparing the squared
+                    # distances to the center of mass. Ties go the second
+                    # way, also when rounding makes one side look a tiny bit
+                    # closer.
+                    dist1 = ((x + orth_x - com_x) ** 2 +
+                             (y + orth_y - com_y) ** 2)
+                    dist2 = ((x - orth_x - com_x) ** 2 +
+                             (y - orth_y - com_y) ** 2)
+                    sign = 1 if dist1 < dist2 - 1e-9 * (dist1 + dist2) else -1
+                    new_x = rounded(x + sign * orth_x)
+                    new_y = rounded(y + sign * orth_y)
+                    if not self.check_collisions(new_x, new_y, r, near, i):
+                        self._move_bubble(i, new_x, new_y)
+
+            if moves / len(self.x) < 0.1:
+                # later moves would be too small to change the layout
+                if self.step_dist < min_step:
+                    break
                 self.step_dist = self.step_dist / 2
 
-    def plot(self, ax, labels, colors=None, min_font=8, max_font=28, 
-         cmap_name='viridis', label_font_threshold=10):
+    def _font_sizes(self, min_font, max_font):
+        # Scale font size linearly
+        radii = self.r
+        if self._r_max > self._r_min:
+            return (min_font + (radii - self._r_min) /
+                    (self._r_max - self._r_min) * (max_font - min_font))
+        return np.full(len(radii), (min_font + max_font) / 2)
+
+    def _colors(self, cmap_name):
+        # colormap colors by bubble size, cached per colormap name. Colormap
+        # objects are not cached, they are unhashable and can be modified.
+        if isinstance(cmap_name, str) and cmap_name in self._cmap_colors:
+            return self._cmap_colors[cmap_name]
+        norm = mcolors.Normalize(vmin=self._r_min, vmax=self._r_max)
+        colors = plt.get_cmap(cmap_name)(norm(self.r))
+        if isinstance(cmap_name, str):
+            self._cmap_colors[cmap_name] = colors
+        return colors
+
+    def plot(self, ax, labels, colors=None, min_font=8, max_font=28,
+             cmap_name='viridis', label_font_threshold=10):
         """
         Draw the bubble plot with font size scaled by bubble size.
         Labels are only shown if font size >= label_font_threshold.
         """
-        radii = self.bubbles[:, 2]
-        r_min, r_max = np.min(radii), np.max(radii)
-    
         if colors is None:
-            norm = mcolors.Normalize(vmin=r_min, vmax=r_max)
-            cmap = cm.get_cmap(cmap_name)
-            colors = [cmap(norm(r)) for r in radii]
-    
-        for i in range(len(self.bubbles)):
-            x, y, r = self.bubbles[i, :3]
-            circ = plt.Circle((x, y), r, color=colors[i], ec="black", lw=2, alpha=0.7)
-            ax.add_patch(circ)
-    
-            # Scale font size linearly
-            font_size = min_font + (r - r_min) / (r_max - r_min) * (max_font - min_font) if r_max > r_min else (min_font + max_font)/2
-    
-            # Show label only if large enough
-            if font_size >= label_font_threshold:
-                ax.text(
-                    x, y, labels[i],
-                    ha='center', va='center',
-                    fontsize=font_size,
-                    color='white',
-                    weight='bold'
-                )
+            colors = self._colors(cmap_name)
+
+        # draw all bubbles at once
+        circles = PatchCollection(
+            [plt.Circle((x, y), r)
+             for x, y, r in zip(self.x, self.y, self.r)],
+            facecolors=colors, edgecolors="black", linewidths=2, alpha=0.7)
+        ax.add_collection(circles)
+
+        font_sizes = self._font_sizes(min_font, max_font)
+
+        # Show label only if large enough
+        for i in np.flatnonzero(font_sizes >= label_font_threshold):
+            x, y = self.x[i], self.y[i]
+            ax.text(
+                x, y, labels[i],
+                ha='center', va='center',
+                fontsize=font_sizes[i],
+                color='white',
+                weight='bold'
+            )
 
     def highlight(self, highlight_indices, ax, labels, colors=None, highlight_color='firebrick', low_alpha=0.2, min_font=8, max_font=28, cmap_name='viridis'):
         """
@@ -162,42 +597,39 @@ class BubbleChart:
         Parameters
         ----------
         highlight_indices : list of int
-            Indices of bubbles to highlight.
+            Indices of bubbles to highlight. Negative or out of range
+            indices are ignored.
         highlight_color : str or color
             Color for highlighted bubbles.
         low_alpha : float
             Transparency for non-highlighted bubbles.
         """
-        radii = self.bubbles[:, 2]
-        r_min, r_max = np.min(radii), np.max(radii)
-
         # Use existing colors or colormap
         if colors is None:
-            norm = mcolors.Normalize(vmin=r_min, vmax=r_max)
-            cmap = cm.get_cmap(cmap_name)
-            colors = [cmap(norm(r)) for r in radii]
+            colors = self._colors(cmap_name)
+        font_sizes = self._font_sizes(min_font, max_font)
 
-        for i in range(len(self.bubbles)):
-            x, y, r = self.bubbles[i, :3]
+        # indices that do not refer to a bubble are ignored
+        indices = np.asarray(highlight_indices, dtype=int)
+        mask = np.zeros(len(self.x), dtype=bool)
+        mask[indices[(indices >= 0) & (indices < len(self.x))]] = True
 
-            # Decide bubble color and alpha
-            if i in highlight_indices:
-                color = highlight_color
-                alpha = 0.9
-            else:
-                color = 'grey' if colors is None else colors[i]
-                alpha = low_alpha
-
-            circ = plt.Circle((x, y), r, color=color, ec="black", lw=2, alpha=alpha)
-            ax.add_patch(circ)
-
-            # Scale font size linearly
-            font_size = min_font + (r - r_min) / (r_max - r_min) * (max_font - min_font) if r_max > r_min else (min_font + max_font)/2
-            if i in highlight_indices:
-                ax.text(
-                    x, y, labels[i],
-                    ha='center', va='center',
-                    fontsize=font_size,
-                    color='white',
-                    weight='bold'
-                )
\ No newline at end of file
+        # draw all bubbles at once, with per bubble color and alpha
+        facecolors = mcolors.to_rgba_array(colors)
+        facecolors[mask] = mcolors.to_rgba(highlight_color)
+        circles = PatchCollection(
+            [plt.Circle((x, y), r)
+             for x, y, r in zip(self.x, self.y, self.r)],
+            facecolors=facecolors, edgecolors="black", linewidths=2)
+        circles.set_alpha(np.where(mask, 0.9, low_alpha))
+        ax.add_collection(circles)
+
+        for i in np.flatnonzero(mask):
+            x, y = self.x[i], self.y[i]
+            ax.text(
+                x, y, labels[i],
+                ha='center', va='center',
+                fontsize=font_sizes[i],
+                color='white',
+                weight='bold'
+            )
@@ -0,0 +1,49 @@
+import numpy as np
+
+import fcn_bubble_chart
+
+
+def _collapsed_layout(area, bubble_spacing, n_iterations, path):
+    bubble_chart = fcn_bubble_chart.BubbleChart(area, bubble_spacing)
+    if path == 'python':
+        # the kernel run by the interpreter instead of compiled
+        fcn_bubble_chart._collapse_kernel.py_func(
+            bubble_chart.x, bubble_chart.y, bubble_chart.r, bubble_chart.area,
+            bubble_spacing, bubble_chart.step_dist, n_iterations,
+            1e-3 * bubble_chart.r.min())
+        return bubble_chart.bubbles[:, :2]
+
+    have_numba = fcn_bubble_chart.HAVE_NUMBA
+    fcn_bubble_chart.HAVE_NUMBA = path == 'numba'
+    try:
+        bubble_chart.collapse(n_iterations)
+    finally:
+        fcn_bubble_chart.HAVE_NUMBA = have_numba
+    return bubble_chart.bubbles[:, :2]
+
+
+def test_collapse_paths_agree():
+    """
+    The compiled kernel, the same kernel run by the interpreter and the NumPy
+    implementation give the same layout, also when the detour direction is a
+    tie.
+    """
+    if not fcn_bubble_chart.HAVE_NUMBA:
+        return
+    rng = np.random.default_rng(0)
+    cases = [
+        ([5.05637887, 2.63623592], 0, 1),
+        (rng.uniform(5, 300, 18), 0.3, 50),
+        (rng.uniform(5, 300, 60), 0.3, 50),
+    ]
+    for area, bubble_spacing, n_iterations in cases:
+        expected = _collapsed_layout(area, bubble_spacing, n_iterations,
+                                     'numba')
+        for path in ('python', 'numpy'):
+            np.testing.assert_allclose(
+                _collapsed_layout(area, bubble_spacing, n_iterations, path),
+                expected, atol=1e-4, err_msg=path)
+
+
+if __name__ == '__main__':
+    test_collapse_paths_agree()